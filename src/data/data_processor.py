@@ -1,4 +1,8 @@
-from typing import List, Dict, Any
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from typing import List, Dict, Any, Iterable
 
 
 class DataProcessor:
@@ -6,53 +10,73 @@ class DataProcessor:
     A class for processing and comparing geographical data.
     """
 
-    def process_data(self, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def process_data(self, elements: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Process raw geographical data and extract relevant information.
+        Process raw geographical elements and extract relevant information.
+
+        Elements are consumed one at a time, so a streamed iterator is never
+        materialized as a whole; elements other than ways are discarded.
 
         Args:
-            raw_data (Dict[str, Any]): The raw data containing elements to process.
+            elements (Iterable[Dict[str, Any]]): The raw elements to process.
 
         Returns:
             List[Dict[str, Any]]: A list of processed elements with id,
             geometry, and name.
         """
-        processed_data = []
-
-        for element in raw_data.get("elements", []):
-            if element["type"] == "way":
-                processed_element = self._process(element)
-                processed_data.append(processed_element)
-
-        return processed_data
-
-    def _process(self, element: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Process a single 'way' element.
-
-        Args:
-            element (Dict[str, Any]): The element to process.
-
-        Returns:
-            Dict[str, Any]: A processed element with id, geometry, and name.
-        """
-        return {
-            "id": element["id"],
-            "geometry": self._extract_geometry(element),
-            "name": element.get("tags", {}).get("name"),
-        }
+        return [
+            {
+                "id": element["id"],
+                "geometry": element.get("geometry", []),
+                "name": element.get("tags", {}).get("name"),
+            }
+            for element in elements
+            if element["type"] == "way"
+        ]
 
-    def _extract_geometry(self, element: Dict[str, Any]) -> List[Dict[str, float]]:
+    @staticmethod
+    def to_geodataframe(processed_data: List[Dict[str, Any]]) -> gpd.GeoDataFrame:
         """
-        Extract geometry information from an element.
+        Convert processed elements into a columnar GeoDataFrame.
 
         Args:
-            element (Dict[str, Any]): The element containing geometry information.
+            processed_data (List[Dict[str, Any]]): Processed elements with id,
+            geometry, and name.
 
         Returns:
-            List[Dict[str, float]]: A list of nodes representing the geometry.
+            gpd.GeoDataFrame: A frame with an int64 id column, a name column
+            and LineString geometries in EPSG:4326.
         """
-        return element.get("geometry", []) if element["type"] == "way" else []
+        counts = np.fromiter(
+            (len(element["geometry"]) for element in processed_data),
+            dtype=np.int64,
+            count=len(processed_data),
+        )
+        coordinates = np.array(
+            [
+                (node["lon"], node["lat"])
+                for element in processed_data
+                for node in element["geometry"]
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        geometry = shapely.linestrings(
+            coordinates, indices=np.repeat(np.arange(len(counts)), counts)
+        )
+
+        return gpd.GeoDataFrame(
+            {
+                "id": np.fromiter(
+                    (element["id"] for element in processed_data),
+                    dtype=np.int64,
+                    count=len(processed_data),
+                ),
+                "name": pd.Series(
+                    [element["name"] for element in processed_data], dtype=object
+                ),
+            },
+            geometry=gpd.GeoSeries(geometry, crs="EPSG:4326"),
+        )
 
     @staticmethod
     def is_data_changed(new_data: Any, old_data: Any) -> bool:
@@ -1,13 +1,22 @@
-import json
+import hashlib
+import geopandas as gpd
+import io
 import os
 import psycopg2
 from abc import ABC, abstractmethod
 from psycopg2 import sql
-from typing import Dict, List, Any
+from psycopg2.pool import ThreadedConnectionPool
+from typing import Dict, Any
 from utils.exceptions import DatabaseError
 from utils.config import SQLConfig
 from utils.logger import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import ujson
+
 
 class IDataStorage(ABC):
     """
@@ -38,16 +47,26 @@ class IDataStorage(ABC):
 class JsonDataStorage(IDataStorage):
     """
     Class for saving and retrieving processed data to/from a JSON file.
+
+    SHA-256 digests of the processed data and of the raw downloaded data can
+    be kept in sidecar files next to the JSON file, so changes can be detected
+    without parsing the old data. They are saved separately from the data,
+    once every downstream store has been updated.
     """
 
-    def __init__(self, target: str):
+    def __init__(self, target: str, indent: bool = False):
         """
         Initialize JsonDataStorage.
 
         Args:
             target (str): The path to the JSON file.
+            indent (bool): Whether to pretty-print the JSON file with 2-space
+            indentation, e.g. for debugging. Defaults to compact output.
         """
         self.target = target
+        self.indent = indent
+        self.digest_target = f"{target}.sha256"
+        self.raw_digest_target = f"{target}.raw.sha256"
 
     def save_data(self, data: Dict[str, Any]) -> None:
         """
@@ -56,8 +75,8 @@ class JsonDataStorage(IDataStorage):
         Args:
             data (Dict[str, Any]): The data to be saved.
         """
-        with open(self.target, "w") as f:
-            json.dump(data, f, indent=2)
+        with open(self.target, "wb") as f:
+            f.write(self._dumps(data))
         logger.info(f"New processed data saved to {self.target}")
 
     def get_data(self) -> Dict[str, Any] | None:
@@ -69,8 +88,119 @@ class JsonDataStorage(IDataStorage):
         """
         if not os.path.exists(self.target):
             return None
-        with open(self.target, "r") as f:
-            return json.load(f)
+        with open(self.target, "rb") as f:
+            return self._loads(f.read())
+
+    def get_digest(self) -> str | None:
+        """
+        Retrieve the digest of the processed data last saved.
+
+        Returns:
+            str | None: The hex digest or None if the digest file doesn't exist.
+        """
+        return self._read_digest(self.digest_target)
+
+    def save_digest(self, digest: str) -> None:
+        """
+        Save the digest of the processed data.
+
+        Args:
+            digest (str): The hex digest.
+        """
+        self._write_digest(self.digest_target, digest)
+
+    def get_raw_digest(self) -> str | None:
+        """
+        Retrieve the digest of the raw data the saved data was built from.
+
+        Returns:
+            str | None: The hex digest or None if the digest file doesn't exist.
+        """
+        return self._read_digest(self.raw_digest_target)
+
+    def save_raw_digest(self, digest: str) -> None:
+        """
+        Save the digest of the raw data the saved data was built from.
+
+        Args:
+            digest (str): The hex digest.
+        """
+        self._write_digest(self.raw_digest_target, digest)
+
+    @staticmethod
+    def _read_digest(path: str) -> str | None:
+        """
+        Read a hex digest from a sidecar file.
+
+        Args:
+            path (str): The path to the digest file.
+
+        Returns:
+            str | None: The hex digest or None if the file doesn't exist.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return f.read().strip()
+
+    @staticmethod
+    def _write_digest(path: str, digest: str) -> None:
+        """
+        Write a hex digest to a sidecar file.
+
+        Args:
+            path (str): The path to the digest file.
+            digest (str): The hex digest.
+        """
+        with open(path, "w") as f:
+            f.write(digest)
+
+    @staticmethod
+    def compute_digest(data: Any) -> str:
+        """
+        Compute a SHA-256 digest of data serialized with sorted keys.
+
+        Args:
+            data (Any): The data to compute the digest for.
+
+        Returns:
+            str: The hex digest.
+        """
+        if orjson is not None:
+            raw = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        else:
+            raw = ujson.dumps(data, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _dumps(self, data: Any) -> bytes:
+        """
+        Serialize data to JSON using orjson, or ujson if unavailable.
+
+        Args:
+            data (Any): The data to serialize.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON document, indented if enabled.
+        """
+        if orjson is not None:
+            option = orjson.OPT_INDENT_2 if self.indent else None
+            return orjson.dumps(data, option=option)
+        return ujson.dumps(data, indent=2 if self.indent else 0).encode("utf-8")
+
+    @staticmethod
+    def _loads(raw: bytes) -> Any:
+        """
+        Deserialize a JSON document using orjson, or ujson if unavailable.
+
+        Args:
+            raw (bytes): The UTF-8 encoded JSON document.
+
+        Returns:
+            Any: The deserialized data.
+        """
+        if orjson is not None:
+            return orjson.loads(raw)
+        return ujson.loads(raw)
 
 
 class SqlDataStorage(IDataStorage):
@@ -86,45 +216,88 @@ class SqlDataStorage(IDataStorage):
             config (SQLConfig): Configuration for the SQL database connection.
         """
         self.config = config
+        self._pool: ThreadedConnectionPool | None = None
+
+        table = sql.Identifier(config.table)
+        self._insert_query = sql.SQL(
+            """
+            INSERT INTO {} (id, name, geometry)
+            SELECT id, name, ST_GeomFromWKB(decode(geom, 'hex'), 4326)
+            FROM _stage
+            ON CONFLICT (id) DO UPDATE
+            SET name = EXCLUDED.name,
+                geometry = EXCLUDED.geometry
+        """
+        ).format(table)
+        self._truncate_query = sql.SQL("TRUNCATE TABLE {}").format(table)
 
-    def save_data(self, data: List[Dict[str, Any]]) -> None:
+    def save_data(self, data: gpd.GeoDataFrame) -> None:
         """
         Save data to the SQL database.
 
+        Geometries are sent as WKB encoded by GEOS.
+
         Args:
-            data (List[Dict[str, Any]]): The data to be saved.
+            data (gpd.GeoDataFrame): The data to be saved, with id, name
+            and geometry columns.
 
         Raises:
             DatabaseError: If there's an error inserting data into the database.
         """
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cur:
-                    for item in data:
-                        query = sql.SQL(
-                            """
-                            INSERT INTO {} (id, name, geometry)
-                            VALUES (%s, %s, ST_GeomFromText(%s, 4326))
-                            ON CONFLICT (id) DO UPDATE
-                            SET name = EXCLUDED.name,
-                                geometry = EXCLUDED.geometry
-                        """
-                        ).format(sql.Identifier(self.config.table))
-
-                        linestring = self._create_linestring(item["geometry"])
-                        cur.execute(query, (item["id"], item["name"], linestring))
-
-                        conn.commit()
-                    logger.info(
-                        f"Successfully inserted {len(data)} records \
-                        into {self.config.table}"
-                    )
+            buffer = self._build_copy_buffer(data)
+
+            conn = self._get_connection()
+            try:
+                with conn:
+                    with conn.cursor() as cur:
+                        self._copy_and_upsert(cur, buffer)
+                        logger.info(
+                            f"Successfully inserted {len(data)} records \
+                            into {self.config.table}"
+                        )
+            finally:
+                self._release_connection(conn)
         except Exception as e:
             raise DatabaseError(
                 f"Error inserting data into \
                                 {self.config.table}: {e}"
             ) from e
 
+    def replace_data(self, data: gpd.GeoDataFrame) -> None:
+        """
+        Replace all data in the SQL database table in a single transaction.
+
+        If loading the new data fails, the table keeps its previous contents.
+
+        Args:
+            data (gpd.GeoDataFrame): The data to be saved, with id, name
+            and geometry columns.
+
+        Raises:
+            DatabaseError: If there's an error replacing data in the database.
+        """
+        try:
+            buffer = self._build_copy_buffer(data)
+
+            conn = self._get_connection()
+            try:
+                with conn:
+                    with conn.cursor() as cur:
+                        cur.execute(self._truncate_query)
+                        self._copy_and_upsert(cur, buffer)
+                        logger.info(
+                            f"Successfully replaced records in \
+                            {self.config.table} with {len(data)} records"
+                        )
+            finally:
+                self._release_connection(conn)
+        except Exception as e:
+            raise DatabaseError(
+                f"Error replacing data in \
+                                {self.config.table}: {e}"
+            ) from e
+
     def cleanup(self) -> None:
         """
         Remove all data from the SQL database table.
@@ -133,17 +306,17 @@ class SqlDataStorage(IDataStorage):
             DatabaseError: If there's an error removing data from the database.
         """
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cur:
-                    query = sql.SQL("TRUNCATE TABLE {}").format(
-                        sql.Identifier(self.config.table)
-                    )
-                    cur.execute(query)
-                    conn.commit()
-                    logger.info(
-                        f"Successfully removed all records from \
-                        {self.config.table}"
-                    )
+            conn = self._get_connection()
+            try:
+                with conn:
+                    with conn.cursor() as cur:
+                        cur.execute(self._truncate_query)
+                        logger.info(
+                            f"Successfully removed all records from \
+                            {self.config.table}"
+                        )
+            finally:
+                self._release_connection(conn)
         except Exception as e:
             raise DatabaseError(
                 f"Error removing data from \
@@ -161,9 +334,53 @@ class SqlDataStorage(IDataStorage):
         """
         pass
 
+    def _build_copy_buffer(self, data: gpd.GeoDataFrame) -> io.StringIO:
+        """
+        Serialize data into a COPY text format buffer for the staging table.
+
+        Args:
+            data (gpd.GeoDataFrame): The data to serialize.
+
+        Returns:
+            io.StringIO: The buffer positioned at its start.
+        """
+        buffer = io.StringIO()
+        rows = zip(
+            data["id"].tolist(),
+            data["name"].tolist(),
+            data.geometry.to_wkb(hex=True).tolist(),
+        )
+        for element_id, name, geometry in rows:
+            name = self._escape_copy_value(name)
+            buffer.write(f"{element_id}\t{name}\t{geometry}\n")
+        buffer.seek(0)
+        return buffer
+
+    def _copy_and_upsert(self, cur, buffer: io.StringIO) -> None:
+        """
+        Stage the buffer with COPY and upsert it into the target table.
+
+        The transaction is committed by the caller.
+
+        Args:
+            cur (psycopg2.extensions.cursor): The cursor to run the queries on.
+            buffer (io.StringIO): The COPY text format buffer.
+        """
+        cur.execute(
+            """
+            CREATE TEMP TABLE _stage (id bigint, name text, geom text)
+            ON COMMIT DROP
+        """
+        )
+        cur.copy_expert("COPY _stage (id, name, geom) FROM STDIN", buffer)
+        cur.execute(self._insert_query)
+
     def _get_connection(self):
         """
-        Create and return a database connection.
+        Take a database connection from the connection pool.
+
+        The pool is created on first use. Connections must be handed back
+        with _release_connection.
 
         Returns:
             psycopg2.extensions.connection: A database connection object.
@@ -172,39 +389,45 @@ class SqlDataStorage(IDataStorage):
             DatabaseError: If there's an error connecting to the database.
         """
         try:
-            return psycopg2.connect(
-                host=self.config.host,
-                port=self.config.port,
-                database=self.config.name,
-                user=self.config.user,
-                password=self.config.password,
-            )
+            if self._pool is None:
+                self._pool = ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=10,
+                    host=self.config.host,
+                    port=self.config.port,
+                    database=self.config.name,
+                    user=self.config.user,
+                    password=self.config.password,
+                )
+            return self._pool.getconn()
         except psycopg2.Error as e:
             raise DatabaseError(f"Error connecting to database: {e}") from e
 
+    def _release_connection(self, conn) -> None:
+        """
+        Return a database connection to the connection pool.
+
+        Args:
+            conn (psycopg2.extensions.connection): The connection to return.
+        """
+        self._pool.putconn(conn)
+
     @staticmethod
-    def _create_linestring(
-        coordinates: List[Dict[str, float]] | List[List[float]]
-    ) -> str:
+    def _escape_copy_value(value: str | None) -> str:
         """
-        Create a LINESTRING representation from coordinates.
+        Escape a value for the PostgreSQL COPY text format.
 
         Args:
-            coordinates (List[Dict[str, float]] | List[List[float]]): The coordinates
-            to convert.
+            value (str | None): The value to escape.
 
         Returns:
-            str: The LINESTRING representation.
-
-        Raises:
-            ValueError: If the coordinate format is unexpected.
-        """
-        points = []
-        for coord in coordinates:
-            if isinstance(coord, dict):
-                points.append(f"{coord['lon']} {coord['lat']}")
-            elif isinstance(coord, (list, tuple)):
-                points.append(f"{coord[0]} {coord[1]}")
-            else:
-                raise ValueError(f"Unexpected coordinate format: {coord}")
-        return f"LINESTRING({', '.join(points)})"
+            str: The escaped value, or the NULL marker if value is None.
+        """
+        if value is None:
+            return "\\N"
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
@@ -1,12 +1,25 @@
+import json
+import os
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
+from typing import Dict
 from utils.exceptions import GeocodingError
 from utils.logger import logger
 
 
 class Geocoder:
-    def __init__(self, user_agent: str):
+    def __init__(self, user_agent: str, cache_path: str | None = None):
+        """
+        Initialize the Geocoder.
+
+        Args:
+            user_agent (str): User agent sent to the Nominatim service.
+            cache_path (str | None): Path to a JSON file caching bounding boxes
+            by region name. Caching is disabled if not provided.
+        """
         self.geolocator = Nominatim(user_agent=user_agent)
+        self.cache_path = cache_path
+        self._cache = self._load_cache()
 
     def get_region_bbox(self, region_name: str) -> str:
         """
@@ -21,6 +34,10 @@ class Geocoder:
         Raises:
             GeocodingError: If geocoding fails or no results are found.
         """
+        if region_name in self._cache:
+            logger.info(f"Using cached bounding box for {region_name}")
+            return self._cache[region_name]
+
         try:
             location = self.geolocator.geocode(region_name, exactly_one=True)
             if not location:
@@ -29,7 +46,7 @@ class Geocoder:
             logger.info(
                 f"Found bounding box for {region_name}: {location.raw['boundingbox']}"
             )
-            return ",".join(
+            bbox = ",".join(
                 [
                     location.raw["boundingbox"][0],
                     location.raw["boundingbox"][2],
@@ -40,3 +57,36 @@ class Geocoder:
 
         except (GeocoderTimedOut, GeocoderUnavailable) as e:
             raise GeocodingError(f"Geocoding service error: {e}") from e
+
+        self._cache[region_name] = bbox
+        self._save_cache()
+        return bbox
+
+    def _load_cache(self) -> Dict[str, str]:
+        """
+        Load cached bounding boxes from the cache file.
+
+        Returns:
+            Dict[str, str]: Bounding boxes by region name, empty if the cache
+            is disabled, missing or unreadable.
+        """
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable bounding box cache: {e}")
+            return {}
+
+    def _save_cache(self) -> None:
+        """
+        Save cached bounding boxes to the cache file.
+        """
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, "w") as f:
+                json.dump(self._cache, f)
+        except OSError as e:
+            logger.warning(f"Could not save bounding box cache: {e}")
@@ -1,8 +1,9 @@
 import geopandas as gpd
+import numpy as np
+import shapely
 from abc import ABC, abstractmethod
-from collections import defaultdict
 from neo4j import GraphDatabase
-from typing import List, Dict
+from typing import Any, Dict, Iterator, List, Tuple
 from utils.exceptions import GraphBuilderError
 from utils.config import Neo4jConfig
 from utils.logger import logger
@@ -22,6 +23,8 @@ class GraphBuilder(IGraphBuilder):
     for creating nodes and relationships in Neo4j.
     """
 
+    BATCH_SIZE = 5000
+
     def __init__(self, config: Neo4jConfig):
         """
         Initialize the GraphBuilder with Neo4j configuration.
@@ -52,13 +55,35 @@ class GraphBuilder(IGraphBuilder):
         except Exception as e:
             raise GraphBuilderError(f"Error removing graph: {e}") from e
 
-    def build_graph(self, elements: List[Dict], graph_name: str) -> None:
+    def ensure_schema(self) -> None:
         """
-        Build a graph in Neo4j from a list of element dictionaries.
+        Create the uniqueness constraint on Element IDs if it doesn't exist.
+
+        The constraint is backed by an index, so MERGE and MATCH on Element.id
+        are index lookups instead of label scans.
+
+        Raises:
+            GraphBuilderError: If there's an error creating the constraint.
+        """
+        try:
+            with self.driver.session(database="neo4j") as session:
+                session.run(
+                    """
+                    CREATE CONSTRAINT element_id IF NOT EXISTS
+                    FOR (e:Element) REQUIRE e.id IS UNIQUE
+                    """
+                )
+            logger.info("Neo4j schema constraints ensured.")
+        except Exception as e:
+            raise GraphBuilderError(f"Error creating graph schema: {e}") from e
+
+    def build_graph(self, elements: gpd.GeoDataFrame, graph_name: str) -> None:
+        """
+        Build a graph in Neo4j from a GeoDataFrame of elements.
 
         Args:
-            elements (List[Dict]): List of dictionaries containing the elements
-            to build the graph.
+            elements (gpd.GeoDataFrame): Frame with id, name and LineString
+            geometry columns containing the elements to build the graph.
             graph_name (str): The name to assign to the created graph.
 
         Raises:
@@ -72,93 +97,215 @@ class GraphBuilder(IGraphBuilder):
         except Exception as e:
             raise GraphBuilderError(f"Error building graph: {e}") from e
 
-    def _create_nodes(self, session, elements: List[Dict]) -> None:
+    def _create_nodes(self, session, elements: gpd.GeoDataFrame) -> None:
         """
-        Create nodes in Neo4j from the elements in the list.
+        Create nodes in Neo4j from the elements in the frame.
 
         Args:
             session: Neo4j session object.
-            elements (List[Dict]): List of dictionaries containing the elements
+            elements (gpd.GeoDataFrame): Frame containing the elements
             to create nodes from.
         """
-        nodes = [{"id": element["id"], "name": element["name"]} for element in elements]
-        session.run(
+        nodes = [
+            {"id": element_id, "name": name}
+            for element_id, name in zip(
+                elements["id"].tolist(), elements["name"].tolist()
+            )
+        ]
+        self._write_in_batches(
+            session,
             """
-            UNWIND $nodes AS node
+            UNWIND $batch AS node
             MERGE (e:Element {id: node.id})
             SET e.name = node.name
         """,
-            nodes=nodes,
+            nodes,
         )
 
-    def _create_relationships(self, session, elements: List[Dict]) -> None:
+    def _create_relationships(self, session, elements: gpd.GeoDataFrame) -> None:
         """
         Create relationships between nodes in Neo4j based on the elements' geometry.
 
+        A single CONNECTS_TO relationship is stored per connected pair, pointing
+        from the lower to the higher element ID. The reverse edge is not
+        created, so queries must match it without a direction, e.g.
+        (a)-[:CONNECTS_TO]-(b); a directed pattern finds only some connections.
+
         Args:
             session: Neo4j session object.
-            elements (List[Dict]): List of dictionaries containing the elements
+            elements (gpd.GeoDataFrame): Frame containing the elements
             to create relationships from.
         """
-        connection_map = self._build_connection_map(elements)
-        relationships = self._generate_relationships(connection_map)
+        ids, offsets = self._build_connection_groups(elements)
+        relationships = self._generate_relationships(ids, offsets)
 
-        session.run(
+        self._write_in_batches(
+            session,
             """
-            UNWIND $relationships AS rel
+            UNWIND $batch AS rel
             MATCH (a:Element {id: rel.from}), (b:Element {id: rel.to})
-            MERGE (a)-[:CONNECTS_TO]->(b)
-            MERGE (b)-[:CONNECTS_TO]->(a)
+            MERGE (a)-[:CONNECTS_TO]-(b)
         """,
-            relationships=relationships,
+            relationships,
         )
 
-    def _build_connection_map(self, elements: List[Dict]) -> Dict:
+    def _write_in_batches(self, session, query: str, items: List[Dict]) -> None:
+        """
+        Run a write query over items, one transaction per batch.
+
+        Args:
+            session: Neo4j session object.
+            query (str): Cypher query reading the batch from the $batch parameter.
+            items (List[Dict]): Items to pass to the query.
+        """
+        for batch in self._chunked(items, self.BATCH_SIZE):
+            session.execute_write(self._run_batch, query, batch)
+
+    @staticmethod
+    def _run_batch(tx, query: str, batch: List[Dict]) -> None:
         """
-        Build a map of connections between elements based on their geometry.
+        Run a query for a single batch inside a write transaction.
 
         Args:
-            elements (List[Dict]): List of dictionaries containing the elements
+            tx: Neo4j managed transaction object.
+            query (str): Cypher query reading the batch from the $batch parameter.
+            batch (List[Dict]): Items to pass to the query.
+        """
+        tx.run(query, batch=batch).consume()
+
+    @staticmethod
+    def _chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+        """
+        Split a list into consecutive chunks.
+
+        Args:
+            items (List[Any]): The list to split.
+            size (int): The maximum chunk size.
+
+        Yields:
+            List[Any]: Consecutive chunks of at most size items.
+        """
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
+    def _build_connection_groups(
+        self, elements: gpd.GeoDataFrame
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Group elements that share an endpoint based on their geometry.
+
+        Endpoints are matched on coordinates quantized to 1e-7 degrees
+        (the precision OSM stores nodes with), packed into a single integer key.
+
+        Args:
+            elements (gpd.GeoDataFrame): Frame containing the elements
             to build connections from.
 
         Returns:
-            Dict: A dictionary mapping coordinate tuples to sets of element IDs.
+            Tuple[np.ndarray, np.ndarray]: A flat int64 array of element IDs,
+            grouped by shared endpoint and sorted in ascending order within
+            each group, and an array of offsets where group i spans
+            ids[offsets[i]:offsets[i + 1]].
         """
-        connection_map = defaultdict(set)
-        for element in elements:
-            start_point = (
-                element["geometry"][0]["lat"],
-                element["geometry"][0]["lon"],
-            )
-            end_point = (
-                element["geometry"][-1]["lat"],
-                element["geometry"][-1]["lon"],
+        if elements.empty:
+            return np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+        ids, start_lat, start_lon, end_lat, end_lon = self._extract_endpoints(elements)
+        keys = np.concatenate(
+            (
+                self._quantize_points(start_lat, start_lon),
+                self._quantize_points(end_lat, end_lon),
             )
-            connection_map[start_point].add(element["id"])
-            connection_map[end_point].add(element["id"])
-        return connection_map
+        )
+        owners = np.concatenate((ids, ids))
+
+        order = np.lexsort((owners, keys))
+        keys, owners = keys[order], owners[order]
+        unique = np.ones(len(keys), dtype=bool)
+        unique[1:] = (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])
+        keys, owners = keys[unique], owners[unique]
 
-    def _generate_relationships(self, connection_map: Dict) -> List[Dict]:
+        bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        offsets = np.concatenate(([0], bounds, [len(keys)]))
+        return owners, offsets
+
+    @staticmethod
+    def _quantize_points(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
         """
-        Generate relationships between elements based on the connection map.
+        Pack coordinates into integer keys of 1e-7 degree fixed-point values.
 
         Args:
-            connection_map (Dict): A dictionary mapping coordinate tuples
-            to sets of element IDs.
+            lat (np.ndarray): Latitudes in degrees.
+            lon (np.ndarray): Longitudes in degrees.
+
+        Returns:
+            np.ndarray: A uint64 array with the latitude in the high 32 bits
+            and the longitude in the low 32 bits.
+        """
+        mask = np.uint64(0xFFFFFFFF)
+        lat_fixed = np.rint(lat * 1e7).astype(np.int64).astype(np.uint64) & mask
+        lon_fixed = np.rint(lon * 1e7).astype(np.int64).astype(np.uint64) & mask
+        return (lat_fixed << np.uint64(32)) | lon_fixed
+
+    @staticmethod
+    def _extract_endpoints(
+        elements: gpd.GeoDataFrame,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract element IDs and endpoint coordinates into parallel arrays.
+
+        Args:
+            elements (gpd.GeoDataFrame): Frame containing the elements
+            to extract endpoints from.
+
+        Returns:
+            Tuple[np.ndarray, ...]: Arrays of element IDs, start latitudes,
+            start longitudes, end latitudes and end longitudes.
+        """
+        geometry = elements.geometry.values
+        start = shapely.get_point(geometry, 0)
+        end = shapely.get_point(geometry, -1)
+        return (
+            elements["id"].to_numpy(dtype=np.int64),
+            shapely.get_y(start),
+            shapely.get_x(start),
+            shapely.get_y(end),
+            shapely.get_x(end),
+        )
+
+    def _generate_relationships(
+        self, ids: np.ndarray, offsets: np.ndarray
+    ) -> List[Dict]:
+        """
+        Generate relationships between elements based on the connection groups.
+
+        Pairs are generated for all groups of the same size at once, and each
+        connected pair is emitted once, with the lower ID as "from", even if
+        the elements share more than one endpoint.
+
+        Args:
+            ids (np.ndarray): A flat array of element IDs grouped by shared
+            endpoint and sorted in ascending order within each group.
+            offsets (np.ndarray): Group boundaries in ids.
 
         Returns:
             List[Dict]: A list of dictionaries representing relationships
             between elements.
         """
-        relationships = []
-        for connected_ids in connection_map.values():
-            if len(connected_ids) > 1:
-                connected_list = list(connected_ids)
-                relationships.extend(
-                    [
-                        {"from": connected_list[i], "to": connected_list[j]}
-                        for i in range(len(connected_list))
-                        for j in range(i + 1, len(connected_list))
-                    ]
-                )
-        return relationships
+        sizes = np.diff(offsets)
+        sources, targets = [], []
+        for size in np.unique(sizes[sizes > 1]).tolist():
+            starts = offsets[:-1][sizes == size]
+            groups = ids[starts[:, np.newaxis] + np.arange(size)]
+            first, second = np.triu_indices(size, k=1)
+            sources.append(groups[:, first].ravel())
+            targets.append(groups[:, second].ravel())
+
+        if not sources:
+            return []
+
+        pairs = np.unique(
+            np.column_stack((np.concatenate(sources), np.concatenate(targets))),
+            axis=0,
+        )
+        return [{"from": from_id, "to": to_id} for from_id, to_id in pairs.tolist()]
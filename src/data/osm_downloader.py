@@ -1,40 +1,122 @@
+import hashlib
+import ijson
 import requests
-from typing import Dict
+import tempfile
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
+from typing import IO, Dict, Iterator, Tuple
+from urllib3.util.retry import Retry
 from utils.exceptions import OsmApiError
 from utils.logger import logger
 
 
 class OSMDownloader:
+    CHUNK_SIZE = 64 * 1024
+
     def __init__(self, api_url: str):
         """
         Initialize the OSMDownloader.
 
+        A single HTTP session is kept open, so connections to the API are
+        reused across requests. Failed requests are retried with backoff.
+
         Args:
             api_url (str): The URL of the OpenStreetMap API.
         """
         self.api_url = api_url
+        self.raw_digest: str | None = None
 
-    def download_data(self, bbox: str) -> Dict:
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1,
+                status_forcelist=(429, 502, 503, 504),
+            ),
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @contextmanager
+    def download_data(self, bbox: str) -> Iterator[Iterator[Dict]]:
         """
         Download river data for the given bounding box.
 
+        The response body is spooled to a temporary file while its SHA-256
+        digest is computed and stored in raw_digest. The yielded iterator
+        then parses the file incrementally, so the whole JSON document is
+        never materialized in memory. Use as a context manager; the file is
+        closed on exit whether or not the elements were consumed.
+
         Args:
             bbox (str): Bounding box coordinates.
 
-        Returns:
-            Dict: JSON response containing river data.
+        Yields:
+            Iterator[Dict]: Iterator over the elements of the JSON response.
 
         Raises:
-            OsmApiError: If there's an error downloading the data.
+            OsmApiError: If there's an error downloading the data. Errors raised
+            while parsing the response body are raised during iteration.
         """
         query = self._build_query(bbox)
 
         try:
             response = self._make_request(query)
-            logger.info(f"Downloaded data for bbox: {bbox}")
-            return response.json()
+            body, self.raw_digest = self._spool_response(response)
         except requests.RequestException as e:
             raise OsmApiError(f"Error downloading river data: {e}") from e
+        logger.info(f"Downloaded data for bbox: {bbox}")
+
+        with body:
+            yield self._iter_elements(body)
+
+    def _spool_response(self, response: requests.Response) -> Tuple[IO[bytes], str]:
+        """
+        Write the decoded response body to a temporary file and hash it.
+
+        Args:
+            response (requests.Response): The streamed HTTP response object.
+
+        Returns:
+            Tuple[IO[bytes], str]: The temporary file positioned at its start
+            and the hex digest of the body.
+
+        Raises:
+            requests.RequestException: If there's an error reading the response.
+        """
+        digest = hashlib.sha256()
+        body = tempfile.TemporaryFile()
+        try:
+            with response:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    digest.update(chunk)
+                    body.write(chunk)
+        except BaseException:
+            body.close()
+            raise
+        body.seek(0)
+        return body, digest.hexdigest()
+
+    @staticmethod
+    def _iter_elements(body: IO[bytes]) -> Iterator[Dict]:
+        """
+        Stream elements from the response body.
+
+        Args:
+            body (IO[bytes]): The response body.
+
+        Yields:
+            Dict: A single element of the response.
+
+        Raises:
+            OsmApiError: If there's an error parsing the response.
+        """
+        try:
+            yield from ijson.items(body, "elements.item", use_float=True)
+        except ijson.JSONError as e:
+            raise OsmApiError(f"Error reading river data: {e}") from e
 
     @staticmethod
     def _build_query(bbox: str) -> str:
@@ -58,7 +140,10 @@ class OSMDownloader:
 
     def _make_request(self, query: str) -> requests.Response:
         """
-        Make an HTTP request to the OpenStreetMap API.
+        Make a streamed HTTP request to the OpenStreetMap API.
+
+        A compressed response is requested; it is decoded while the body
+        is read.
 
         Args:
             query (str): The Overpass QL query string.
@@ -69,6 +154,15 @@ class OSMDownloader:
         Raises:
             requests.RequestException: If there's an error making the request.
         """
-        response = requests.get(self.api_url, params={"data": query})
-        response.raise_for_status()
+        response = self._session.get(
+            self.api_url,
+            params={"data": query},
+            headers={"Accept-Encoding": "gzip, deflate"},
+            stream=True,
+        )
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
         return response
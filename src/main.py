@@ -38,10 +38,15 @@ def main():
         Config.validate()
 
         # Initialize components
-        geocoder = Geocoder(user_agent=Config.GEOCODING_AGENT)
+        geocoder = Geocoder(
+            user_agent=Config.GEOCODING_AGENT,
+            cache_path=Config.get_bbox_cache_file_path(),
+        )
         downloader = OSMDownloader(api_url=Config.OSM_API_URL)
         processor = DataProcessor()
-        json_storage = JsonDataStorage(target=Config.get_output_file_path())
+        json_storage = JsonDataStorage(
+            target=Config.get_output_file_path(), indent=Config.DEBUG
+        )
         sql_storage = SqlDataStorage(config=Config.SQL_CONFIG)
         graph_builder = GraphBuilder(config=Config.NEO4J_CONFIG)
 
@@ -50,29 +55,45 @@ def main():
         bbox = geocoder.get_region_bbox(Config.REGION)
 
         logger.info(f"Downloading data for region: {Config.REGION}")
-        raw_data = downloader.download_data(bbox)
-
-        logger.info(f"Processing data for region: {Config.REGION}")
-        processed_data = processor.process_data(raw_data)
-
-        if not processor.is_data_changed(processed_data, json_storage.get_data()):
+        with downloader.download_data(bbox) as elements:
+            if not processor.is_data_changed(
+                downloader.raw_digest, json_storage.get_raw_digest()
+            ):
+                logger.info(
+                    f"Downloaded data is not changed for region: {Config.REGION}, "
+                    "skipping"
+                )
+                return
+
+            logger.info(f"Processing data for region: {Config.REGION}")
+            processed_data = processor.process_data(elements)
+
+        digest = json_storage.compute_digest(processed_data)
+        if not processor.is_data_changed(digest, json_storage.get_digest()):
             logger.info(
                 f"Processed data is not changed for region: {Config.REGION}, skipping"
             )
+            json_storage.save_raw_digest(downloader.raw_digest)
             return
 
         # Store data
         logger.info(f"Saving processed data to {Config.get_output_file_path()}")
         json_storage.save_data(processed_data)
 
+        frame = processor.to_geodataframe(processed_data)
+
         logger.info("Inserting new data into database")
-        sql_storage.cleanup()
-        sql_storage.save_data(processed_data)
+        sql_storage.replace_data(frame)
 
         # Build graph
         logger.info("Creating new graph")
         graph_builder.cleanup()
-        graph_builder.build_graph(processed_data, Config.NEO4J_CONFIG.graph_name)
+        graph_builder.ensure_schema()
+        graph_builder.build_graph(frame, Config.NEO4J_CONFIG.graph_name)
+
+        # Mark the data as in sync only once every store has been updated
+        json_storage.save_digest(digest)
+        json_storage.save_raw_digest(downloader.raw_digest)
 
     except ConfigError as e:
         logger.error(f"Config is not valid: {e}", exc_info=Config.DEBUG)
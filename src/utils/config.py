@@ -56,6 +56,7 @@ class Config:
 
     OUTPUT_DIR_PATH = os.getenv("OUTPUT_DIR_PATH")
     OUTPUT_FILE_NAME = os.getenv("OUTPUT_FILE_NAME")
+    BBOX_CACHE_FILE_NAME = os.getenv("BBOX_CACHE_FILE_NAME", "bbox_cache.json")
     GEOCODING_AGENT = os.getenv("GEOCODING_AGENT")
 
     OSM_API_URL = os.getenv("OSM_API_URL")
@@ -65,6 +66,11 @@ class Config:
         """Get the full path of the output file."""
         return os.path.join(cls.OUTPUT_DIR_PATH, cls.OUTPUT_FILE_NAME)
 
+    @classmethod
+    def get_bbox_cache_file_path(cls) -> str:
+        """Get the full path of the bounding box cache file."""
+        return os.path.join(cls.OUTPUT_DIR_PATH, cls.BBOX_CACHE_FILE_NAME)
+
     @classmethod
     def validate(cls) -> None:
         """Validate the configuration settings."""